@@ -1,9 +1,8 @@
-import os
 c.ServerProxy.servers = {
   'atoti': {
     'command': [
       'python',
-       'finance/value-at-risk/main.py', 
+       'finance/value-at-risk/main.py',
     ],
     'timeout': 120,
     'launcher_entry': {
@@ -11,8 +10,12 @@ c.ServerProxy.servers = {
     },
     'port': 9999,
   },
-    'start': {
+  'start': {
     'command': ['python3', '-m', 'http.server', '{port}', '--directory', 'redirect'],
     'absolute_url': False
+  },
+  'test-server': {
+    'command': ['python3', '-m', 'http.server', '{port}'],
+    'absolute_url': False
   }
 }
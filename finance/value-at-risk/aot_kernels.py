@@ -0,0 +1,58 @@
+"""Ahead-of-time compilation of the fixed-length VaR kernels.
+
+All the jitted kernels in `kernels.py` use ``cache=True``, but the very
+first run after an environment change still pays a multi-second compile.
+Running ``python aot_kernels.py`` compiles the fixed-length kernels once
+into a ``var_kernels`` shared object next to this file; when present,
+`kernels.var_fixed` dlopens it instead of JIT-compiling, so a fresh
+notebook kernel restart costs nothing.
+
+The ``numba.pycc`` AOT compiler was deprecated in numba 0.57 and removed
+afterwards, so building the shared object requires an older toolchain
+(``pip install "numba<0.57"`` in a throwaway env is enough — the produced
+``var_kernels`` module has no runtime dependency on numba). On newer numba
+this script exits with an explanatory error; everything in `kernels.py`
+keeps working through the JIT path.
+
+The AOT target does not support ``parallel=True``, so these exports are
+the serial variants; the JIT kernels remain the parallel fast path once
+they are warm.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba.pycc import CC
+except ImportError as error:
+    raise ImportError(
+        "numba.pycc was removed from recent numba releases; build the AOT "
+        "kernels with numba < 0.57 or rely on the cached JIT kernels in "
+        "kernels.py."
+    ) from error
+
+cc = CC("var_kernels")
+
+
+@cc.export("var_272", "f8[:](f4[:,::1], f8)")
+def var_272(vectors, q):
+    out = np.empty(vectors.shape[0])
+    k = int(math.floor((1 - q) * 272))
+    for i in range(vectors.shape[0]):
+        row = vectors[i].copy()
+        out[i] = np.partition(row, k)[k]
+    return out
+
+
+@cc.export("var_372", "f8[:](f4[:,::1], f8)")
+def var_372(vectors, q):
+    out = np.empty(vectors.shape[0])
+    k = int(math.floor((1 - q) * 372))
+    for i in range(vectors.shape[0]):
+        row = vectors[i].copy()
+        out[i] = np.partition(row, k)[k]
+    return out
+
+
+if __name__ == "__main__":
+    cc.compile()
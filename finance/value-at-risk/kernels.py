@@ -0,0 +1,222 @@
+import math
+
+import numpy as np
+from numba import njit, prange
+
+try:
+    # AOT-compiled fixed-length kernels, built once by `python aot_kernels.py`.
+    # Loading the shared object skips the JIT cold start on kernel restarts.
+    import var_kernels
+except ImportError:
+    var_kernels = None
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def var_batch(vectors, q):
+    """Compute the VaR of many PnL vectors in a single jitted pass.
+
+    This mirrors the cube's ``atoti.array.quantile`` measure but runs locally
+    on a contiguous matrix, which is handy to double-check the VaR figures or
+    to run side computations without going through the cube. ``np.partition``
+    only does the selection work needed for one quantile, O(N) instead of the
+    O(N log N) full sort, and ``prange`` spreads the rows over all cores.
+
+    Args:
+        vectors: A 2D float array of shape (n_vectors, vector_length), one
+            simulated PnL vector per row.
+        q: The confidence level, e.g. 0.95.
+
+    Returns:
+        A 1D array with the VaR of each row.
+    """
+    out = np.empty(vectors.shape[0])
+    k = int(math.floor((1 - q) * vectors.shape[1]))
+    for i in prange(vectors.shape[0]):
+        row = vectors[i].copy()
+        out[i] = np.partition(row, k)[k]
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _kth_smallest_272(row, k):
+    # The literal 272 bound lets LLVM unroll and vectorize the scan, and for
+    # the small k of a VaR quantile (k=13 at 95%) an insertion-based top-k
+    # beats a full partition of the row. The buffer is seeded from the first
+    # k+1 elements rather than inf sentinels: fastmath assumes no infinities,
+    # so comparing against them would be undefined.
+    top = np.sort(row[: k + 1])
+    for j in range(k + 1, 272):
+        v = row[j]
+        if v < top[k]:
+            p = k
+            while p > 0 and top[p - 1] > v:
+                top[p] = top[p - 1]
+                p -= 1
+            top[p] = v
+    return top[k]
+
+
+@njit(cache=True, fastmath=True)
+def _kth_smallest_372(row, k):
+    top = np.sort(row[: k + 1])
+    for j in range(k + 1, 372):
+        v = row[j]
+        if v < top[k]:
+            p = k
+            while p > 0 and top[p - 1] > v:
+                top[p] = top[p - 1]
+                p -= 1
+            top[p] = v
+    return top[k]
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def var_272(vectors, q):
+    """VaR kernel specialized to the 272-wide PnL vectors."""
+    out = np.empty(vectors.shape[0])
+    k = int(math.floor((1 - q) * 272))
+    for i in prange(vectors.shape[0]):
+        out[i] = _kth_smallest_272(vectors[i], k)
+    return out
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def var_372(vectors, q):
+    """VaR kernel specialized to the 372-wide short-volatility PnL vectors."""
+    out = np.empty(vectors.shape[0])
+    k = int(math.floor((1 - q) * 372))
+    for i in prange(vectors.shape[0]):
+        out[i] = _kth_smallest_372(vectors[i], k)
+    return out
+
+
+def var_fixed(vectors, q):
+    """Compute the VaR with the kernel specialized to the vector length.
+
+    The vector length is a per-model constant (272, or 372 in the
+    short-volatility file), so the specialized kernels compile their inner
+    loop with a literal bound that LLVM can fully unroll and vectorize.
+    When the AOT-compiled
+    `var_kernels` module is available (see `aot_kernels.py`), it is
+    preferred: its compile cost was paid once at install time instead of on
+    the first call. Other lengths fall back to the generic :func:`var_batch`.
+
+    Args:
+        vectors: A 2D float array of shape (n_vectors, vector_length).
+        q: The confidence level, e.g. 0.95.
+
+    Returns:
+        A 1D array with the VaR of each row.
+    """
+    if vectors.shape[1] == 272:
+        if var_kernels is not None:
+            return var_kernels.var_272(vectors, q)
+        return var_272(vectors, q)
+    if vectors.shape[1] == 372:
+        if var_kernels is not None:
+            return var_kernels.var_372(vectors, q)
+        return var_372(vectors, q)
+    return var_batch(vectors, q)
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def var_batch_sorted(sorted_vectors, q):
+    """Compute the VaR of many pre-sorted PnL vectors.
+
+    When the rows are already sorted — `pnl_data.load_pnl_matrix` caches them
+    that way — the quantile degenerates to one index lookup per row, with no
+    selection work at all.
+
+    Args:
+        sorted_vectors: A 2D float array whose rows are sorted ascending.
+        q: The confidence level, e.g. 0.95.
+
+    Returns:
+        A 1D array with the VaR of each row.
+    """
+    out = np.empty(sorted_vectors.shape[0])
+    k = int(math.floor((1 - q) * sorted_vectors.shape[1]))
+    for i in prange(sorted_vectors.shape[0]):
+        out[i] = sorted_vectors[i, k]
+    return out
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def var_multi_sorted(sorted_vectors, qs):
+    """Compute the VaR of many pre-sorted PnL vectors at several levels.
+
+    Like :func:`var_multi` but skipping the per-row sort entirely: each
+    (row, confidence level) pair is a single index lookup.
+
+    Args:
+        sorted_vectors: A 2D float array whose rows are sorted ascending.
+        qs: A 1D array of confidence levels.
+
+    Returns:
+        A 2D array of shape (n_vectors, n_confidence_levels).
+    """
+    out = np.empty((sorted_vectors.shape[0], qs.shape[0]))
+    ks = np.empty(qs.shape[0], dtype=np.int64)
+    for s in range(qs.shape[0]):
+        ks[s] = int(math.floor((1 - qs[s]) * sorted_vectors.shape[1]))
+    for i in prange(sorted_vectors.shape[0]):
+        for s in range(qs.shape[0]):
+            out[i, s] = sorted_vectors[i, ks[s]]
+    return out
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def var_multi(vectors, qs):
+    """Compute the VaR of many PnL vectors at several confidence levels.
+
+    Each row is sorted a single time and every confidence level then becomes
+    an O(1) index into the sorted row, instead of one selection pass per
+    scenario. The `Worst` scenario (q = 1.0) naturally maps to index 0, the
+    minimum of the distribution.
+
+    Args:
+        vectors: A 2D float array of shape (n_vectors, vector_length), one
+            simulated PnL vector per row.
+        qs: A 1D array of confidence levels, e.g. [0.90, 0.95, 0.98, 0.99, 1.0].
+
+    Returns:
+        A 2D array of shape (n_vectors, n_confidence_levels) with the VaR of
+        each row at each confidence level.
+    """
+    out = np.empty((vectors.shape[0], qs.shape[0]))
+    ks = np.empty(qs.shape[0], dtype=np.int64)
+    for s in range(qs.shape[0]):
+        ks[s] = int(math.floor((1 - qs[s]) * vectors.shape[1]))
+    for i in prange(vectors.shape[0]):
+        row = np.sort(vectors[i])
+        for s in range(qs.shape[0]):
+            out[i, s] = row[ks[s]]
+    return out
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def position_vector(quantities, vectors):
+    """Scale the PnL vectors by the held quantities and sum them per day.
+
+    This is the local equivalent of the cube's `Position Vector` measure,
+    with the multiply and the accumulate fused into a single pass: no
+    272-wide scaled intermediate is materialized per instrument, which
+    halves the memory traffic, and LLVM turns the inner loop into FMA
+    instructions.
+
+    Args:
+        quantities: A 1D float32 array with the aggregated quantity held of
+            each instrument, aligned with the rows of ``vectors``.
+        vectors: A 2D float32 array of shape (n_instruments, vector_length).
+
+    Returns:
+        A 1D float32 array with the scaled PnL summed over instruments for
+        each day of history.
+    """
+    out = np.empty(vectors.shape[1], dtype=np.float32)
+    for j in prange(vectors.shape[1]):
+        acc = np.float32(0.0)
+        for i in range(vectors.shape[0]):
+            acc += quantities[i] * vectors[i, j]
+        out[j] = acc
+    return out
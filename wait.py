@@ -1,14 +1,32 @@
-import time
-import requests
-while True:
-  try:
-    request = requests.get("http://localhost:9999/")
-    if request.status_code == 200:
-      print("URL is ready")
-      break
-    else:
-      print("Waiting for URL, current status is " + str(request.status_code))
-  except Exception as e:
-    print(e)
-    print("Waiting for URL, connexion failed")
-  time.sleep(1)
+import asyncio
+
+import aiohttp
+
+
+async def wait_ready(url="http://localhost:9999/"):
+  """Poll the server over a single keep-alive connection until it answers.
+
+  One TCP connection is opened and reused for every probe, a HEAD request is
+  enough to read the status code, and the delay backs off exponentially from
+  50 ms up to 2 s so a ready server is detected almost immediately. Being a
+  coroutine, the wait is also cancellable.
+  """
+  connector = aiohttp.TCPConnector(limit=1, keepalive_timeout=30)
+  timeout = aiohttp.ClientTimeout(total=1)
+  async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+    delay = 0.05
+    while True:
+      try:
+        async with session.head(url) as response:
+          if response.status == 200:
+            print("URL is ready")
+            return
+          print("Waiting for URL, current status is " + str(response.status))
+      except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+        print("Waiting for URL, connexion failed")
+      await asyncio.sleep(delay)
+      delay = min(delay * 2, 2.0)
+
+
+if __name__ == "__main__":
+  asyncio.run(wait_ready())